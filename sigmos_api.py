@@ -4,14 +4,19 @@ SigMOS音频质量评估API服务
 提供HTTP接口进行音频文件质量评估
 """
 
+import hashlib
+import io
+import json
+import mmap
 import os
+import sqlite3
 import sys
 import tempfile
-import uuid
-from flask import Flask, request, jsonify, send_from_directory
-from werkzeug.utils import secure_filename
+from flask import Flask, request, jsonify, send_from_directory, Response
 import soundfile as sf
 import numpy as np
+import librosa
+import onnxruntime as ort
 from datetime import datetime
 import traceback
 
@@ -20,29 +25,258 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'ICASSP2024', 'sigmos'))
 
 from sigmos import SigMOS, Version
 
+# orjson序列化比标准json快数倍且原生输出UTF-8，装了就用，没装回退jsonify
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# numba可选：装了就JIT特征压缩内核，没装回退到基类的numpy实现
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+
+if njit is not None:
+    @njit(cache=True, parallel=True)
+    def _compress_mag_numba(spec_re, spec_im, compress_factor):
+        """压缩幅度谱特征的JIT内核，融合numpy实现里的多次中间数组分配"""
+        n_frames, n_bins = spec_re.shape
+        out = np.empty((3, n_frames, n_bins), dtype=np.float32)
+        for f in prange(n_frames):
+            for k in range(n_bins):
+                re = spec_re[f, k]
+                im = spec_im[f, k]
+                x2 = re * re + im * im
+                if x2 < 1e-12:
+                    x2 = 1e-12
+                scale = x2 ** ((compress_factor - 1.0) / 2.0)
+                out[0, f, k] = x2 ** (compress_factor / 2.0)
+                out[1, f, k] = scale * re
+                out[2, f, k] = scale * im
+        return out
+
+
+class TunedSigMOS(SigMOS):
+    """SigMOS子类：用调优后的会话选项重建ONNX推理会话
+
+    基类默认使用单线程会话，模型推理是每个/evaluate请求的计算热点，
+    这里启用完整图优化（算子融合）和多线程并行来降低单次推理延迟，
+    并按可用性自动选择GPU执行后端（CUDA/DirectML），CPU作为兜底。
+    """
+
+    # 按优先级排列的执行后端，构造时与实际可用的取交集
+    PREFERRED_PROVIDERS = [
+        'CUDAExecutionProvider',
+        'DmlExecutionProvider',
+        'CPUExecutionProvider',
+    ]
+
+    def __init__(self, model_dir, model_version=Version.V1):
+        super().__init__(model_dir=model_dir, model_version=model_version)
+
+        model_path = os.path.join(
+            model_dir, 'model-sigmos_1697718653_41d092e8-epo-200.onnx')
+
+        # int8动态量化模型按需启用：先用quantize_model.py生成，
+        # 再以SIGMOS_INT8=1启动（量化有轻微评分偏差，所以不默认开启）
+        int8_path = model_path.replace('.onnx', '-int8.onnx')
+        if os.environ.get('SIGMOS_INT8') and os.path.exists(int8_path):
+            model_path = int8_path
+            print(f"✅ 使用int8量化模型: {os.path.basename(int8_path)}")
+
+        so = ort.SessionOptions()
+        so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        so.intra_op_num_threads = os.cpu_count() or 1
+        so.inter_op_num_threads = 2
+        so.execution_mode = ort.ExecutionMode.ORT_PARALLEL
+        so.add_session_config_entry("session.use_env_allocators", "1")
+
+        available = ort.get_available_providers()
+        providers = [p for p in self.PREFERRED_PROVIDERS if p in available]
+
+        # 用调优后的选项重建会话，替换基类创建的单线程会话
+        self.session = ort.InferenceSession(model_path, so, providers=providers)
+        print(f"✅ ONNX执行后端: {self.session.get_providers()[0]}")
+
+        # 输入名在会话生命周期内不变，缓存下来避免每次请求重查get_inputs()
+        self._input_names = [inp.name for inp in self.session.get_inputs()]
+
+    def features_from_spec(self, spec):
+        """复数谱 -> 模型输入特征，装了numba时走JIT内核"""
+        if njit is None:
+            return self.compressed_mag_complex(spec)
+        spec_re = np.ascontiguousarray(spec.real)
+        spec_im = np.ascontiguousarray(spec.imag)
+        return np.expand_dims(_compress_mag_numba(spec_re, spec_im, 0.3), 0)
+
+    def run(self, audio: np.ndarray, sr=None):
+        """与基类逻辑一致，但复用缓存的输入名并确保特征张量连续
+
+        特征经transpose后是跨步视图，onnxruntime会在内部再拷贝一次；
+        这里显式压成连续内存，把拷贝控制在一处。
+        """
+        if sr is not None and sr != self.sampling_rate:
+            audio = librosa.resample(audio, orig_sr=sr,
+                                     target_sr=self.sampling_rate,
+                                     res_type=self.resample_type)
+
+        spec = self.stft(audio)
+        features = np.ascontiguousarray(self.features_from_spec(spec))
+
+        onnx_inputs = {name: features for name in self._input_names}
+        output = self.session.run(None, onnx_inputs)[0][0]
+
+        return {
+            'MOS_COL': float(output[0]), 'MOS_DISC': float(output[1]),
+            'MOS_LOUD': float(output[2]), 'MOS_NOISE': float(output[3]),
+            'MOS_REVERB': float(output[4]), 'MOS_SIG': float(output[5]),
+            'MOS_OVRL': float(output[6])
+        }
+
 app = Flask(__name__)
 
 # 配置
-UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'wav', 'mp3', 'flac', 'm4a'}
 MAX_CONTENT_LENGTH = 100 * 1024 * 1024  # 100MB
 
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
 app.config['JSON_AS_ASCII'] = False  # 确保中文不被转义
 
-# 确保上传目录存在
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-
 # 全局变量存储模型实例
 sigmos_estimator = None
 model_dir = None
 
+# 评估结果缓存：按音频内容哈希记忆结果，重复上传同一文件时跳过整个ONNX前向
+# 两级结构：进程内LRU（微秒级）+ SQLite持久化（跨重启、跨worker进程共享）
+RESULT_CACHE_SIZE = 512
+_result_cache = {}  # 内容哈希 -> 评估结果（dict自3.7起保持插入顺序，够做LRU）
+
+CACHE_DB_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'mos_cache.db')
+
+def content_hash(raw_bytes):
+    """计算音频原始字节的内容哈希，作为结果缓存的键"""
+    return hashlib.blake2b(raw_bytes, digest_size=16).hexdigest()
+
+# 每次读写连接的busy超时（秒）：多worker争抢写锁时宁可放弃缓存
+# 也不能让评估请求在sqlite3默认的5秒超时上卡住
+CACHE_DB_TIMEOUT = 0.2
+
+def init_cache_db():
+    """初始化结果持久化缓存的SQLite库"""
+    try:
+        with sqlite3.connect(CACHE_DB_PATH) as conn:
+            # WAL模式下读写不互斥，多个gunicorn worker并发写缓存
+            # 不再在回滚日志的全库写锁后排队
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS mos_cache ("
+                "hash TEXT PRIMARY KEY, result TEXT, created TEXT)")
+    except Exception as e:
+        print(f"⚠️  结果缓存库初始化失败（不影响评估）: {e}")
+
+def db_cache_lookup(key):
+    """查询SQLite持久化缓存，失败时静默返回None"""
+    try:
+        with sqlite3.connect(CACHE_DB_PATH, timeout=CACHE_DB_TIMEOUT) as conn:
+            row = conn.execute(
+                "SELECT result FROM mos_cache WHERE hash = ?", (key,)).fetchone()
+        if row is not None:
+            return json.loads(row[0])
+    except Exception:
+        pass
+    return None
+
+def db_cache_store(key, result):
+    """写入SQLite持久化缓存，失败时静默忽略"""
+    try:
+        with sqlite3.connect(CACHE_DB_PATH, timeout=CACHE_DB_TIMEOUT) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO mos_cache (hash, result, created) "
+                "VALUES (?, ?, ?)",
+                (key, json.dumps(result, ensure_ascii=False),
+                 datetime.now().isoformat()))
+    except Exception:
+        pass
+
+def cache_lookup(key):
+    """查询结果缓存：先查进程内LRU，未命中再查SQLite并回填"""
+    result = _result_cache.pop(key, None)
+    if result is not None:
+        # 重新插入移到末尾，维持LRU顺序
+        _result_cache[key] = result
+        return result
+
+    result = db_cache_lookup(key)
+    if result is not None:
+        _result_cache[key] = result
+        if len(_result_cache) > RESULT_CACHE_SIZE:
+            del _result_cache[next(iter(_result_cache))]
+    return result
+
+def cache_store(key, result):
+    """写入两级结果缓存，LRU超出容量时淘汰最久未用的条目"""
+    _result_cache[key] = result
+    if len(_result_cache) > RESULT_CACHE_SIZE:
+        del _result_cache[next(iter(_result_cache))]
+    db_cache_store(key, result)
+
+init_cache_db()
+
+def error_result(context, exc):
+    """构建异常结果：完整堆栈记到服务端日志，响应里只带错误消息
+
+    logging只在处理器真正输出时才格式化堆栈（懒格式化），
+    正常请求路径不再为每个异常拼接traceback字符串；
+    调试时设DEV=1可在响应中附带堆栈。
+    """
+    app.logger.exception(context)
+    result = {
+        "success": False,
+        "error": str(exc)
+    }
+    if os.environ.get('DEV'):
+        result["traceback"] = traceback.format_exc()
+    return result
+
+def json_response(data, status=200):
+    """构建JSON响应：优先用orjson直接生成Response，绕过jsonify的序列化开销"""
+    if orjson is None:
+        return jsonify(data), status
+    return Response(orjson.dumps(data), status=status,
+                    mimetype='application/json')
+
 def allowed_file(filename):
     """检查文件扩展名是否允许"""
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def sniff_audio_format(header):
+    """根据文件头魔数识别音频容器格式，无法识别时返回None
+
+    扩展名可以随意改，魔数不行；在完整读取/解码之前用前12字节
+    把明显不是音频的上传挡下来。
+    """
+    if header[:4] == b'RIFF' and header[8:12] == b'WAVE':
+        return 'wav'
+    if header[:4] == b'fLaC':
+        return 'flac'
+    if header[:3] == b'ID3':
+        return 'mp3'
+    if len(header) >= 2 and header[0] == 0xFF and (header[1] & 0xE0) == 0xE0:
+        return 'mp3'  # 无ID3标签的裸MPEG帧
+    if header[4:8] == b'ftyp':
+        return 'm4a'
+    return None
+
+def sniff_upload(file):
+    """读取上传流的前几个字节做魔数检查，并把流位置复位"""
+    header = file.stream.read(12)
+    file.stream.seek(0)
+    return sniff_audio_format(header)
+
 def init_sigmos_model():
     """初始化SigMOS模型"""
     global sigmos_estimator, model_dir
@@ -56,84 +290,189 @@ def init_sigmos_model():
         if not os.path.exists(model_file):
             raise FileNotFoundError(f"模型文件不存在: {model_file}")
         
-        sigmos_estimator = SigMOS(model_dir=model_dir, model_version=Version.V1)
+        sigmos_estimator = TunedSigMOS(model_dir=model_dir, model_version=Version.V1)
         print(f"✅ SigMOS模型初始化成功: {model_file}")
+
+        # 预热：首次session.run要做内核选择和内存池分配（numba路径还有
+        # JIT编译），启动时用半秒静音先跑一遍，首个请求不再承担这部分开销
+        warmup_start = datetime.now()
+        sigmos_estimator.run(
+            np.zeros(sigmos_estimator.sampling_rate // 2, dtype=np.float32),
+            sr=sigmos_estimator.sampling_rate)
+        warmup_ms = (datetime.now() - warmup_start).total_seconds() * 1000
+        print(f"✅ 模型预热完成 ({warmup_ms:.0f} ms)")
+
         return True
         
     except Exception as e:
         print(f"❌ SigMOS模型初始化失败: {e}")
         return False
 
+def cached_result(cache_key, filename):
+    """查缓存并整理命中结果（刷新时间戳/文件名并打cached标记），未命中返回None"""
+    cached = cache_lookup(cache_key)
+    if cached is None:
+        return None
+
+    result = dict(cached)
+    result["timestamp"] = datetime.now().isoformat()
+    file_info = dict(cached["file_info"])
+    file_info["filename"] = filename
+    result["file_info"] = file_info
+    result["cached"] = True
+    return result
+
 def evaluate_audio_file(audio_file_path):
-    """评估音频文件并返回结果"""
+    """评估指定路径的音频文件并返回结果"""
+    # 检查文件是否存在
+    if not os.path.exists(audio_file_path):
+        return {"error": f"音频文件不存在: {audio_file_path}"}
+
+    filename = os.path.basename(audio_file_path)
+
+    try:
+        # 磁盘文件不整体读入Python堆：mmap映射后直接喂给哈希，
+        # 页缓存按需加载，大WAV/FLAC不再产生全量字节副本
+        with open(audio_file_path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                cache_key = content_hash(mm)
+
+        cached = cached_result(cache_key, filename)
+        if cached is not None:
+            return cached
+
+        # libsndfile直接从磁盘流式解码，同样不需要完整字节副本
+        try:
+            audio_data, sample_rate = sf.read(audio_file_path, dtype='float32')
+        except Exception:
+            with open(audio_file_path, 'rb') as f:
+                audio_data, sample_rate = fallback_decode(f.read(), filename)
+
+        return evaluate_decoded_audio(audio_data, sample_rate, filename,
+                                      cache_key)
+
+    except Exception as e:
+        return error_result("评估音频失败", e)
+
+def fallback_decode(raw_bytes, filename):
+    """libsndfile无法解码的格式（如m4a）经临时文件交给librosa解码
+
+    仅在内存解码失败时走这条慢路径；wav/flac/mp3由libsndfile
+    在内存中直接完成，不会落盘。
+    """
+    suffix = os.path.splitext(filename)[1] or '.audio'
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+        tmp.write(raw_bytes)
+        tmp_path = tmp.name
+
+    try:
+        audio_data, sample_rate = librosa.load(tmp_path, sr=None, mono=False)
+        if audio_data.ndim > 1:
+            # librosa返回(通道, 采样点)，转成与soundfile一致的(采样点, 通道)
+            audio_data = audio_data.T
+        return audio_data, sample_rate
+    finally:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+def evaluate_audio_bytes(raw_bytes, filename):
+    """评估内存中的音频数据并返回结果"""
+    try:
+        # 按内容哈希查询缓存，命中时直接返回（微秒级 vs 数百毫秒的ONNX推理）
+        cache_key = content_hash(raw_bytes)
+
+        cached = cached_result(cache_key, filename)
+        if cached is not None:
+            return cached
+
+        # 直接从内存解码音频，不经过磁盘（libsndfile原生支持wav/flac/mp3）
+        # dtype='float32'让libsndfile直接输出float32，省去默认float64
+        # 带来的双倍内存和后续降精度转换（模型特征本来就是float32）
+        try:
+            audio_data, sample_rate = sf.read(io.BytesIO(raw_bytes),
+                                              dtype='float32')
+        except Exception:
+            audio_data, sample_rate = fallback_decode(raw_bytes, filename)
+
+        return evaluate_decoded_audio(audio_data, sample_rate, filename,
+                                      cache_key)
+
+    except Exception as e:
+        return error_result("评估音频失败", e)
+
+def evaluate_decoded_audio(audio_data, sample_rate, filename, cache_key):
+    """对解码后的音频做预处理、推理并构建结果"""
     global sigmos_estimator
-    
+
     try:
-        # 检查文件是否存在
-        if not os.path.exists(audio_file_path):
-            return {"error": f"音频文件不存在: {audio_file_path}"}
-        
-        # 读取音频文件
-        audio_data, sample_rate = sf.read(audio_file_path)
-        
         # 获取文件信息
         file_info = {
-            "filename": os.path.basename(audio_file_path),
+            "filename": filename,
             "file_size_samples": len(audio_data),
             "sample_rate": int(sample_rate),
             "duration_seconds": round(len(audio_data) / sample_rate, 2)
         }
         
         # 如果是立体声，取单声道
+        # 切片得到的是跨步视图，后续分帧/FFT会对其反复隐式拷贝，
+        # 这里一次性压成连续内存
         if len(audio_data.shape) > 1:
-            audio_data = audio_data[:, 0]
+            audio_data = np.ascontiguousarray(audio_data[:, 0])
             file_info["converted_to_mono"] = True
         else:
             file_info["converted_to_mono"] = False
         
+        # 在入口一次性重采样到模型采样率（soxr远快于SigMOS内部的FFT重采样），
+        # 之后以目标采样率调用，SigMOS内部不再重复重采样
+        target_sr = sigmos_estimator.sampling_rate
+        if sample_rate != target_sr:
+            audio_data = librosa.resample(
+                audio_data, orig_sr=sample_rate, target_sr=target_sr,
+                res_type='soxr_hq')
+            file_info["resampled_from"] = int(sample_rate)
+            sample_rate = target_sr
+
         # 使用SigMOS进行评估
         result = sigmos_estimator.run(audio_data, sr=sample_rate)
         
-        # 构建返回结果 - 使用OrderedDict保持顺序
-        from collections import OrderedDict
-        
+        # 构建返回结果 - dict自Python 3.7起保持插入顺序
         # 按照期望的顺序构建MOS评分
-        mos_scores = OrderedDict([
-            ("整体质量_MOS_OVRL", round(result['MOS_OVRL'], 3)),
-            ("信号质量_MOS_SIG", round(result['MOS_SIG'], 3)),
-            ("噪声程度_MOS_NOISE", round(result['MOS_NOISE'], 3)),
-            ("响度_MOS_LOUD", round(result['MOS_LOUD'], 3)),
-            ("着色度_MOS_COL", round(result['MOS_COL'], 3)),
-            ("不连续性_MOS_DISC", round(result['MOS_DISC'], 3)),
-            ("混响_MOS_REVERB", round(result['MOS_REVERB'], 3))
-        ])
-        
-        raw_scores = OrderedDict([
-            ("MOS_OVRL", float(result['MOS_OVRL'])),
-            ("MOS_SIG", float(result['MOS_SIG'])),
-            ("MOS_NOISE", float(result['MOS_NOISE'])),
-            ("MOS_LOUD", float(result['MOS_LOUD'])),
-            ("MOS_COL", float(result['MOS_COL'])),
-            ("MOS_DISC", float(result['MOS_DISC'])),
-            ("MOS_REVERB", float(result['MOS_REVERB']))
-        ])
-        
-        evaluation_result = OrderedDict([
-            ("success", True),
-            ("timestamp", datetime.now().isoformat()),
-            ("file_info", file_info),
-            ("mos_scores", mos_scores),
-            ("raw_scores", raw_scores)
-        ])
-        
+        mos_scores = {
+            "整体质量_MOS_OVRL": round(result['MOS_OVRL'], 3),
+            "信号质量_MOS_SIG": round(result['MOS_SIG'], 3),
+            "噪声程度_MOS_NOISE": round(result['MOS_NOISE'], 3),
+            "响度_MOS_LOUD": round(result['MOS_LOUD'], 3),
+            "着色度_MOS_COL": round(result['MOS_COL'], 3),
+            "不连续性_MOS_DISC": round(result['MOS_DISC'], 3),
+            "混响_MOS_REVERB": round(result['MOS_REVERB'], 3)
+        }
+
+        raw_scores = {
+            "MOS_OVRL": float(result['MOS_OVRL']),
+            "MOS_SIG": float(result['MOS_SIG']),
+            "MOS_NOISE": float(result['MOS_NOISE']),
+            "MOS_LOUD": float(result['MOS_LOUD']),
+            "MOS_COL": float(result['MOS_COL']),
+            "MOS_DISC": float(result['MOS_DISC']),
+            "MOS_REVERB": float(result['MOS_REVERB'])
+        }
+
+        evaluation_result = {
+            "success": True,
+            "timestamp": datetime.now().isoformat(),
+            "file_info": file_info,
+            "mos_scores": mos_scores,
+            "raw_scores": raw_scores
+        }
+
+        cache_store(cache_key, evaluation_result)
+
         return evaluation_result
         
     except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "traceback": traceback.format_exc()
-        }
+        return error_result("评估音频失败", e)
 
 @app.route('/', methods=['GET'])
 def index():
@@ -143,6 +482,7 @@ def index():
         "version": "1.0",
         "endpoints": {
             "POST /evaluate": "上传音频文件进行评估",
+            "POST /evaluate_batch": "批量上传音频文件进行评估",
             "POST /evaluate_url": "通过URL评估音频文件",
             "GET /health": "健康检查",
             "GET /info": "服务信息"
@@ -217,26 +557,26 @@ def evaluate_uploaded_file():
             "error": f"不支持的文件格式，支持的格式: {', '.join(ALLOWED_EXTENSIONS)}"
         }), 400
     
+    # 魔数检查：内容明显不是音频时直接拒绝，不再读取完整文件
+    if sniff_upload(file) is None:
+        return jsonify({
+            "success": False,
+            "error": "文件内容不是支持的音频格式（魔数校验失败）"
+        }), 400
+
     try:
-        # 保存上传的文件
-        filename = secure_filename(file.filename)
-        unique_filename = f"{uuid.uuid4()}_{filename}"
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
-        file.save(file_path)
-        
-        # 评估音频文件
-        result = evaluate_audio_file(file_path)
-        
-        # 删除临时文件
-        try:
-            os.remove(file_path)
-        except:
-            pass
-        
+        # 直接从上传流读取到内存评估，省去临时文件的写入/重读/删除
+        # 文件名只回显在JSON里、不落盘，取basename即可，
+        # 不再为每个请求跑secure_filename的正则清洗
+        filename = os.path.basename(file.filename)
+        raw_bytes = file.read()
+
+        result = evaluate_audio_bytes(raw_bytes, filename)
+
         if result.get("success", False):
-            return jsonify(result)
+            return json_response(result)
         else:
-            return jsonify(result), 500
+            return json_response(result, 500)
             
     except Exception as e:
         return jsonify({
@@ -244,6 +584,62 @@ def evaluate_uploaded_file():
             "error": f"处理文件时出错: {str(e)}"
         }), 500
 
+@app.route('/evaluate_batch', methods=['POST'])
+def evaluate_uploaded_batch():
+    """批量评估上传的音频文件
+
+    一次请求携带多个files字段，在服务端循环完成全部评估，
+    省去批量场景下每个文件一次HTTP往返的开销。
+    """
+
+    files = request.files.getlist('files')
+    if not files:
+        return jsonify({
+            "success": False,
+            "error": "没有上传文件，请使用files字段（可多个）"
+        }), 400
+
+    results = []
+    for file in files:
+        if file.filename == '':
+            results.append({
+                "success": False,
+                "error": "没有选择文件"
+            })
+            continue
+
+        if not allowed_file(file.filename):
+            results.append({
+                "success": False,
+                "filename": file.filename,
+                "error": f"不支持的文件格式，支持的格式: {', '.join(ALLOWED_EXTENSIONS)}"
+            })
+            continue
+
+        if sniff_upload(file) is None:
+            results.append({
+                "success": False,
+                "filename": file.filename,
+                "error": "文件内容不是支持的音频格式（魔数校验失败）"
+            })
+            continue
+
+        try:
+            filename = os.path.basename(file.filename)
+            results.append(evaluate_audio_bytes(file.read(), filename))
+        except Exception as e:
+            results.append({
+                "success": False,
+                "filename": file.filename,
+                "error": f"处理文件时出错: {str(e)}"
+            })
+
+    return json_response({
+        "success": True,
+        "count": len(results),
+        "results": results
+    })
+
 @app.route('/evaluate_path', methods=['POST'])
 def evaluate_file_path():
     """评估指定路径的音频文件"""
@@ -266,11 +662,11 @@ def evaluate_file_path():
     
     # 评估音频文件
     result = evaluate_audio_file(file_path)
-    
+
     if result.get("success", False):
-        return jsonify(result)
+        return json_response(result)
     else:
-        return jsonify(result), 500
+        return json_response(result, 500)
 
 @app.errorhandler(413)
 def too_large(e):
@@ -288,19 +684,36 @@ def internal_error(e):
         "error": "内部服务器错误"
     }), 500
 
+if __name__ != '__main__':
+    # 由gunicorn等WSGI服务器以模块方式导入时，在导入阶段完成模型初始化
+    if not init_sigmos_model():
+        print("❌ 模型初始化失败，服务无法启动")
+        sys.exit(1)
+
 if __name__ == '__main__':
+    if not os.environ.get('DEV'):
+        # Flask开发服务器串行处理请求，并发客户端下ONNX推理吞吐会崩溃；
+        # 生产环境请使用gunicorn的gevent worker（推理在ONNX C++中释放GIL，
+        # 上传等I/O可与计算重叠）
+        ncores = os.cpu_count() or 1
+        print("⚠️  Flask开发服务器仅用于调试，请通过gunicorn启动生产服务:")
+        print(f"   gunicorn -k gevent -w {ncores * 2} --worker-connections 100 "
+              "-b 0.0.0.0:5000 sigmos_api:app")
+        print("   （勿加--preload：ONNX会话不是fork安全的，须由各worker自行加载）")
+        print("   （调试模式: DEV=1 python3 sigmos_api.py）")
+        sys.exit(1)
+
     print("🚀 启动SigMOS音频质量评估API服务...")
-    
+
     # 初始化模型
     if not init_sigmos_model():
         print("❌ 模型初始化失败，服务无法启动")
         sys.exit(1)
-    
+
     print("📡 服务启动配置:")
     print(f"   - 端口: 5000")
     print(f"   - 支持格式: {', '.join(ALLOWED_EXTENSIONS)}")
     print(f"   - 最大文件大小: {MAX_CONTENT_LENGTH // (1024 * 1024)} MB")
-    print(f"   - 上传目录: {UPLOAD_FOLDER}")
     print()
     print("🌐 API接口:")
     print("   - GET  /          - 服务首页")
@@ -12,10 +12,10 @@ fi
 
 # 检查依赖包
 echo "📦 检查依赖包..."
-python3 -c "import flask, soundfile, numpy, scipy, librosa, onnxruntime" 2>/dev/null
+python3 -c "import flask, soundfile, numpy, scipy, librosa, onnxruntime, gunicorn, gevent" 2>/dev/null
 if [ $? -ne 0 ]; then
     echo "❌ 缺少依赖包，正在安装..."
-    pip3 install flask soundfile numpy scipy librosa onnxruntime
+    pip3 install flask soundfile numpy scipy librosa onnxruntime gunicorn gevent
 fi
 
 # 检查模型文件
@@ -26,9 +26,12 @@ if [ ! -f "$MODEL_FILE" ]; then
     exit 1
 fi
 
-# 创建上传目录
-mkdir -p uploads
-
 # 启动服务
-echo "🌐 启动API服务..."
-python3 sigmos_api.py
\ No newline at end of file
+# gevent worker下上传等I/O可与ONNX推理（C++中释放GIL）重叠。
+# 注意不要加--preload：InferenceSession的线程池不是fork安全的，
+# master里建好的会话fork到worker后session.run会死锁，
+# 模型必须由每个worker在导入sigmos_api时各自初始化
+NCORES=$(python3 -c "import os; print(os.cpu_count() or 1)")
+echo "🌐 启动API服务 (gunicorn, ${NCORES}核)..."
+exec gunicorn -k gevent -w $((NCORES * 2)) --worker-connections 100 \
+    -b 0.0.0.0:5000 sigmos_api:app
\ No newline at end of file
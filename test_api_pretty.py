@@ -7,7 +7,7 @@ import requests
 import json
 import sys
 import os
-from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 def pretty_print_json(data, indent=2):
     """美化打印JSON，确保中文正确显示和顺序保持"""
@@ -121,58 +121,131 @@ def test_file_path(base_url, file_path):
         print(f"❌ 路径评估失败: {e}")
         return False
 
+def batch_evaluate_files(base_url, audio_files):
+    """通过/evaluate_batch接口一次请求评估全部文件
+
+    服务端不支持该接口（旧版本）时返回None，由调用方回退到逐个上传。
+    """
+    handles = []
+    try:
+        files = []
+        for file_path in audio_files:
+            f = open(file_path, 'rb')
+            handles.append(f)
+            files.append(('files', (os.path.basename(file_path), f)))
+
+        response = requests.post(f"{base_url}/evaluate_batch", files=files)
+    except Exception as e:
+        print(f"❌ 批量接口请求失败: {e}")
+        return None
+    finally:
+        for f in handles:
+            f.close()
+
+    if response.status_code == 404:
+        # 旧版服务端没有批量接口
+        return None
+
+    if response.status_code != 200:
+        print(f"❌ 批量接口请求失败，状态码: {response.status_code}")
+        return None
+
+    results = []
+    for i, (file_path, result) in enumerate(
+            zip(audio_files, response.json().get('results', [])), 1):
+        filename = os.path.basename(file_path)
+        print(f"\n[{i}/{len(audio_files)}] 测试文件: {filename}")
+
+        if result.get('success', False):
+            mos_scores = result['mos_scores']
+            overall_score = mos_scores.get('整体质量_MOS_OVRL', 0)
+            results.append((filename, overall_score, mos_scores))
+            print(f"  ✅ 整体质量: {overall_score:.3f}")
+        else:
+            print(f"  ❌ 评估失败: {result.get('error', '未知错误')}")
+
+        print("-" * 40)
+
+    return results
+
+def evaluate_single_file(base_url, file_path):
+    """上传单个文件评估，返回 (文件名, 整体质量, MOS评分) 或 (文件名, None, 错误信息)"""
+    filename = os.path.basename(file_path)
+
+    try:
+        with open(file_path, 'rb') as f:
+            files = {'file': f}
+            response = requests.post(f"{base_url}/evaluate", files=files)
+
+        if response.status_code == 200:
+            result = response.json()
+            if result.get('success', False):
+                mos_scores = result['mos_scores']
+                overall_score = mos_scores.get('整体质量_MOS_OVRL', 0)
+                return (filename, overall_score, mos_scores)
+            return (filename, None, f"评估失败: {result.get('error', '未知错误')}")
+        return (filename, None, f"请求失败，状态码: {response.status_code}")
+
+    except Exception as e:
+        return (filename, None, f"处理失败: {e}")
+
+def parallel_evaluate_files(base_url, audio_files, max_workers=4):
+    """并发上传评估文件（批量接口不可用时的回退路径）
+
+    上传和服务端推理通过线程池重叠，上传时延不再串行累加。
+    """
+    results = []
+    done = 0
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(audio_files))) as pool:
+        futures = [pool.submit(evaluate_single_file, base_url, file_path)
+                   for file_path in audio_files]
+
+        for future in as_completed(futures):
+            filename, overall_score, detail = future.result()
+            done += 1
+            print(f"\n[{done}/{len(audio_files)}] 测试文件: {filename}")
+
+            if overall_score is not None:
+                results.append((filename, overall_score, detail))
+                print(f"  ✅ 整体质量: {overall_score:.3f}")
+            else:
+                print(f"  ❌ {detail}")
+
+            print("-" * 40)
+
+    return results
+
 def batch_test_files(base_url, directory):
     """批量测试目录下的音频文件"""
     print(f"\n🎶 批量测试目录: {directory}")
-    
+
     if not os.path.exists(directory):
         print(f"❌ 目录不存在: {directory}")
         return
-    
+
     # 获取所有音频文件
     audio_extensions = ['.wav', '.mp3', '.flac', '.m4a']
     audio_files = []
-    
+
     for file in os.listdir(directory):
         if any(file.lower().endswith(ext) for ext in audio_extensions):
             audio_files.append(os.path.join(directory, file))
-    
+
     if not audio_files:
         print(f"❌ 目录中没有找到音频文件")
         return
-    
+
     audio_files.sort()  # 排序文件列表
-    
+
     print(f"找到 {len(audio_files)} 个音频文件")
     print("=" * 80)
-    
-    results = []
-    for i, file_path in enumerate(audio_files, 1):
-        filename = os.path.basename(file_path)
-        print(f"\n[{i}/{len(audio_files)}] 测试文件: {filename}")
-        
-        try:
-            with open(file_path, 'rb') as f:
-                files = {'file': f}
-                response = requests.post(f"{base_url}/evaluate", files=files)
-            
-            if response.status_code == 200:
-                result = response.json()
-                if result.get('success', False):
-                    mos_scores = result['mos_scores']
-                    overall_score = mos_scores.get('整体质量_MOS_OVRL', 0)
-                    results.append((filename, overall_score, mos_scores))
-                    print(f"  ✅ 整体质量: {overall_score:.3f}")
-                else:
-                    print(f"  ❌ 评估失败: {result.get('error', '未知错误')}")
-            else:
-                print(f"  ❌ 请求失败，状态码: {response.status_code}")
-                
-        except Exception as e:
-            print(f"  ❌ 处理失败: {e}")
-        
-        print("-" * 40)
-    
+
+    # 优先走批量接口（一次HTTP往返），不可用时回退到并发逐个上传
+    results = batch_evaluate_files(base_url, audio_files)
+    if results is None:
+        results = parallel_evaluate_files(base_url, audio_files)
+
     # 显示汇总结果
     if results:
         print(f"\n📊 批量测试汇总 (按整体质量排序):")
@@ -45,8 +45,8 @@ def test_audio_file(audio_file_path, model_dir):
     print("-" * 80)
     
     try:
-        # 读取音频文件
-        audio_data, sample_rate = sf.read(audio_file_path)
+        # 读取音频文件（float32解码，与模型特征精度一致且内存减半）
+        audio_data, sample_rate = sf.read(audio_file_path, dtype='float32')
         print(f"  - 文件大小: {len(audio_data)} 采样点")
         print(f"  - 采样率: {sample_rate} Hz")
         print(f"  - 时长: {len(audio_data)/sample_rate:.2f} 秒")